@@ -1,12 +1,15 @@
 """Module for managing configuration and environment variables."""
 
 import os
+from functools import cached_property
 from typing import Optional
 from dotenv import load_dotenv
 from pydantic import SecretStr
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from ..utils.caching import once
 
-# Load environment variables from .env file
+# Load environment variables from .env file once; the settings classes below
+# read from the environment rather than each parsing .env on their own
 load_dotenv()
 
 class ClickHouseSettings(BaseSettings):
@@ -17,43 +20,59 @@ class ClickHouseSettings(BaseSettings):
     password: SecretStr
     database: str = 'default'
 
-    class Config:
-        env_prefix = 'CLICKHOUSE_'
+    model_config = SettingsConfigDict(env_prefix='CLICKHOUSE_')
 
 class MiroSettings(BaseSettings):
     """Settings for Miro API."""
     access_token: SecretStr
     board_id: str
 
-    class Config:
-        env_prefix = 'MIRO_'
+    model_config = SettingsConfigDict(env_prefix='MIRO_')
 
 class StripeSettings(BaseSettings):
     """Settings for Stripe API."""
     api_key: SecretStr
+    # Serve the last cached response when Stripe cannot be reached, as long
+    # as it is no older than cache_fallback_max_age seconds
+    cache_fallback: bool = False
+    cache_fallback_max_age: int = 300
 
-    class Config:
-        env_prefix = 'STRIPE_'
+    model_config = SettingsConfigDict(env_prefix='STRIPE_')
 
 class SecuritySettings(BaseSettings):
     """Security settings."""
     encryption_key: SecretStr
 
-    class Config:
-        env_prefix = ''
+    model_config = SettingsConfigDict(env_prefix='')
 
 class Settings:
-    """Main application settings class."""
+    """Main application settings class.
+
+    Settings are treated as immutable once loaded, so derived values such
+    as the ClickHouse DSN are computed once and cached on the instance.
+    """
     def __init__(self):
         self.clickhouse = ClickHouseSettings()
         self.miro = MiroSettings()
         self.stripe = StripeSettings()
         self.security = SecuritySettings()
 
-    @property
+    @cached_property
     def clickhouse_dsn(self) -> str:
         """Get ClickHouse connection string."""
         return f"clickhouse://{self.clickhouse.user}:{self.clickhouse.password.get_secret_value()}@{self.clickhouse.host}:{self.clickhouse.port}/{self.clickhouse.database}"
 
-# Create global settings instance
-settings = Settings()
+@once
+def get_settings() -> Settings:
+    """Get the global settings instance, creating it on first call.
+    
+    get_settings.cache_clear() makes the next call load the settings again.
+    """
+    return Settings()
+
+
+def __getattr__(name: str):
+    """Resolve the module-level ``settings`` lazily via get_settings."""
+    if name == 'settings':
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
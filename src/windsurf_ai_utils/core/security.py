@@ -1,22 +1,183 @@
 """Module for ensuring security when working with sensitive data."""
 
-from jose import jwt
-from typing import Any, Dict
-from .config import settings
+import base64
+import binascii
+import hashlib
+import hmac
+import orjson
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Mapping
+from ..utils.caching import once
+from .config import get_settings
+
+# Encoded JOSE header of every token we issue; matches PyJWT's HS256 output
+_HS256_HEADER = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b'=')
+
+# Payload encoding options matching json.dumps as used by PyJWT: non-string
+# keys are converted to strings and datetime values are rejected, not
+# silently turned into ISO strings
+_PAYLOAD_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+# Registered time claims; encoding them is left to PyJWT (datetime support)
+_TIME_CLAIMS = frozenset(('exp', 'nbf', 'iat'))
+
+# Registered claims PyJWT validates itself (audience, issuer, subject and JWT
+# ID types); payloads carrying them are encoded and decoded by PyJWT
+_PYJWT_CLAIMS = frozenset(('aud', 'iss', 'sub', 'jti'))
+
+# PyJWT (and the cryptography backend it loads) is imported only where it is
+# needed: for time-claim payloads, foreign tokens and to raise its errors.
+# Signing and verifying our own tokens never touches it.
+
+# PyJWT options for foreign tokens: time claims are checked on every call by
+# _check_time_claims instead, since verified payloads are cached
+_PYJWT_OPTIONS = {'verify_exp': False, 'verify_nbf': False, 'verify_iat': False}
+
+
+def _b64encode(data: bytes) -> bytes:
+    """Encode bytes as unpadded base64url."""
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+def _b64decode(data: bytes) -> bytes:
+    """Decode unpadded base64url bytes."""
+    return base64.urlsafe_b64decode(data + b'=' * (-len(data) % 4))
+
+
+def _check_time_claims(claims: Mapping[str, Any]) -> None:
+    """Validate exp, nbf and iat claims the way PyJWT does (without leeway)."""
+    import jwt
+
+    now = time.time()
+    for claim in _TIME_CLAIMS.intersection(claims):
+        try:
+            value = int(claims[claim])
+        except (TypeError, ValueError, OverflowError) as e:
+            error = jwt.InvalidIssuedAtError if claim == 'iat' else jwt.DecodeError
+            raise error(f'The {claim} claim must be an integer.') from e
+        if claim == 'exp' and value <= now:
+            raise jwt.ExpiredSignatureError('Signature has expired')
+        if claim in ('nbf', 'iat') and value > now:
+            raise jwt.ImmatureSignatureError(f'The token is not yet valid ({claim})')
+
 
 class SecurityManager:
     """Security manager for handling sensitive data."""
     
     def __init__(self):
-        self._encryption_key = settings.security.encryption_key.get_secret_value()
+        self._encryption_key = get_settings().security.encryption_key.get_secret_value()
+        self._key_bytes = self._encryption_key.encode('utf-8')
+        # Keyed once; signing copies it instead of re-deriving the HMAC pads
+        self._hmac_template = hmac.new(self._key_bytes, digestmod=hashlib.sha256)
+        # Verified payload JSON is cached per token, so decrypting the same
+        # token again is a lookup and a JSON parse instead of an HMAC check
+        self._decrypt_cached = lru_cache(maxsize=1024)(self._decrypt)
 
     def encrypt_sensitive_data(self, data: Dict[str, Any]) -> str:
-        """Encrypt sensitive data."""
-        return jwt.encode(data, self._encryption_key, algorithm='HS256')
+        """Encrypt sensitive data.
+        
+        Plain payloads are signed directly as compact HS256 JWTs; payloads
+        with time claims (exp, nbf, iat) go through PyJWT, which converts
+        datetime values to timestamps, as do payloads with aud, iss, sub or
+        jti, which PyJWT validates.
+        
+        Non-ASCII text is written as raw UTF-8 rather than \\u escapes, so
+        such tokens differ byte for byte from PyJWT's while decoding to the
+        same claims.
+        
+        Raises:
+            TypeError: If the payload is not a dict or contains values that
+                are not JSON serializable (including datetime outside the
+                time claims)
+        """
+        if not isinstance(data, dict):
+            raise TypeError(
+                'Expecting a dict object, as JWT only supports JSON objects as payloads.'
+            )
+        if not (_TIME_CLAIMS.isdisjoint(data) and _PYJWT_CLAIMS.isdisjoint(data)):
+            import jwt
+            return jwt.encode(data, self._encryption_key, algorithm='HS256')
+        signing_input = _HS256_HEADER + b'.' + _b64encode(orjson.dumps(data, option=_PAYLOAD_OPTIONS))
+        return (signing_input + b'.' + _b64encode(self._sign(signing_input))).decode('ascii')
+
+    def decrypt_sensitive_data(
+        self, encrypted_data: str, required_claims: Iterable[str] = ()
+    ) -> Dict[str, Any]:
+        """Decrypt sensitive data.
+        
+        The token is verified and decoded once; required and time claims are
+        then checked against that verified payload. Callers should not decode
+        tokens without verification beforehand, as that repeats the work.
+        
+        Verification is cached per token; every call returns a new dict.
+        
+        Args:
+            encrypted_data: Token produced by encrypt_sensitive_data
+            required_claims: Claims that must be present in the payload
+            
+        Raises:
+            jwt.InvalidTokenError: If the token is invalid or expired, or a
+                required claim is missing
+        """
+        claims = orjson.loads(self._decrypt_cached(encrypted_data))
+        for claim in required_claims:
+            if claim not in claims:
+                import jwt
+                raise jwt.MissingRequiredClaimError(claim)
+        if not _TIME_CLAIMS.isdisjoint(claims):
+            _check_time_claims(claims)
+        return claims
 
-    def decrypt_sensitive_data(self, encrypted_data: str) -> Dict[str, Any]:
-        """Decrypt sensitive data."""
-        return jwt.decode(encrypted_data, self._encryption_key, algorithms=['HS256'])
+    def _decrypt(self, encrypted_data: str) -> bytes:
+        """Verify a token and return its payload JSON, without caching or checking claims.
+        
+        Tokens carrying our own header are verified directly; anything else,
+        and payloads with claims PyJWT validates, is handed to PyJWT.
+        """
+        token = encrypted_data.encode('utf-8')
+        signing_input, _, signature = token.rpartition(b'.')
+        header, _, payload = signing_input.partition(b'.')
+        if header != _HS256_HEADER:
+            return self._decrypt_with_pyjwt(encrypted_data)
+
+        # Constant-time comparison of the canonical encoding: decoding the
+        # presented signature instead would accept variants with stray
+        # characters, since base64 decoding silently skips them
+        if not hmac.compare_digest(_b64encode(self._sign(signing_input)), signature):
+            import jwt
+            raise jwt.InvalidSignatureError('Signature verification failed')
+        try:
+            payload_json = _b64decode(payload)
+            claims = orjson.loads(payload_json)
+        except (binascii.Error, orjson.JSONDecodeError) as e:
+            import jwt
+            raise jwt.DecodeError('Invalid payload') from e
+        if not isinstance(claims, dict):
+            import jwt
+            raise jwt.DecodeError('Invalid payload')
+        if not _PYJWT_CLAIMS.isdisjoint(claims):
+            return self._decrypt_with_pyjwt(encrypted_data)
+        return payload_json
+
+    def _decrypt_with_pyjwt(self, encrypted_data: str) -> bytes:
+        """Verify and decode a token with PyJWT and return its payload JSON."""
+        import jwt
+
+        claims = jwt.decode(
+            encrypted_data, self._encryption_key, algorithms=['HS256'], options=_PYJWT_OPTIONS
+        )
+        try:
+            return orjson.dumps(claims)
+        except orjson.JSONEncodeError as e:
+            # orjson cannot encode integers beyond 64 bits
+            raise jwt.DecodeError('Invalid payload') from e
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        """Compute the HS256 signature of a JWT signing input."""
+        mac = self._hmac_template.copy()
+        mac.update(signing_input)
+        return mac.digest()
 
     @staticmethod
     def mask_sensitive_string(value: str, visible_chars: int = 4) -> str:
@@ -26,9 +187,19 @@ class SecurityManager:
             value: String to mask
             visible_chars: Number of characters to leave visible at the end
         """
-        if not value or len(value) <= visible_chars:
-            return '*' * len(value)
-        return '*' * (len(value) - visible_chars) + value[-visible_chars:]
+        length = len(value)
+        if length <= visible_chars:
+            return '*' * length
+        return value[length - visible_chars:].rjust(length, '*')
+
+@once
+def get_security_manager() -> SecurityManager:
+    """Get the global security manager instance, creating it on first call."""
+    return SecurityManager()
+
 
-# Create global security manager instance
-security_manager = SecurityManager()
+def __getattr__(name: str):
+    """Resolve the module-level ``security_manager`` lazily via get_security_manager."""
+    if name == 'security_manager':
+        return get_security_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
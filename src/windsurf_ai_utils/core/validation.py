@@ -1,9 +1,22 @@
 """Module for configuration validation."""
 
-import re
+import string
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
 import requests
-from core.config import settings
+from .config import get_settings
+
+# Allowed characters for Miro access tokens and board IDs
+_TOKEN_CHARS = (string.ascii_letters + string.digits + '_-').encode('ascii')
+
+
+def _is_valid_token(value: str) -> bool:
+    """Check that value is a non-empty string of ASCII letters, digits, '_' or '-'."""
+    return (
+        bool(value)
+        and value.isascii()
+        and not value.encode('ascii').translate(None, _TOKEN_CHARS)
+    )
 
 
 def validate_miro_config() -> Dict[str, Any]:
@@ -19,6 +32,7 @@ def validate_miro_config() -> Dict[str, Any]:
             "warnings": ["Board ID missing trailing equals sign"]
         }
     """
+    settings = get_settings()
     result = {
         "valid": True,
         "errors": [],
@@ -30,7 +44,7 @@ def validate_miro_config() -> Dict[str, Any]:
     if not token:
         result["valid"] = False
         result["errors"].append("Miro access token is missing")
-    elif not re.match(r'^[\w\-_]+$', token):
+    elif not _is_valid_token(token):
         result["valid"] = False
         result["errors"].append("Miro access token has invalid format")
         
@@ -41,12 +55,13 @@ def validate_miro_config() -> Dict[str, Any]:
         result["errors"].append("Miro board ID is missing")
     else:
         # Check if board ID ends with equals sign
-        if not board_id.endswith('='):
+        has_equals = board_id.endswith('=')
+        if not has_equals:
             result["warnings"].append("Board ID might be missing trailing equals sign")
             
-        # Try to clean the board ID
-        clean_id = board_id.rstrip('=')
-        if not re.match(r'^[\w\-_]+$', clean_id):
+        # Try to clean the board ID (padding may be more than one '=')
+        clean_id = board_id.rstrip('=') if has_equals else board_id
+        if not _is_valid_token(clean_id):
             result["valid"] = False
             result["errors"].append("Miro board ID has invalid format")
             
@@ -59,6 +74,7 @@ def validate_clickhouse_config() -> Dict[str, Any]:
     Returns:
         Dictionary with validation results
     """
+    settings = get_settings()
     result = {
         "valid": True,
         "errors": [],
@@ -96,13 +112,23 @@ def validate_clickhouse_config() -> Dict[str, Any]:
     return result
 
 
-def validate_all() -> Dict[str, Dict[str, Any]]:
+def validate_all(parallel: bool = False) -> Dict[str, Dict[str, Any]]:
     """Validate all configurations.
     
+    Args:
+        parallel: Run service validators concurrently. Only worth enabling
+            for validators that perform network checks.
+            
     Returns:
         Dictionary with validation results for each service
     """
-    return {
-        "miro": validate_miro_config(),
-        "clickhouse": validate_clickhouse_config()
+    validators = {
+        "miro": validate_miro_config,
+        "clickhouse": validate_clickhouse_config
     }
+    if not parallel:
+        return {name: validate() for name, validate in validators.items()}
+        
+    with ThreadPoolExecutor(max_workers=len(validators)) as executor:
+        futures = {name: executor.submit(validate) for name, validate in validators.items()}
+        return {name: future.result() for name, future in futures.items()}
@@ -1,20 +1,145 @@
 """Client for working with ClickHouse."""
 
-from typing import List, Dict, Any
-from clickhouse_driver import Client
-from core.config import settings
+import os
+import queue
+from collections import namedtuple
+from contextlib import contextmanager
+from threading import Lock
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator, NamedTuple, Optional, Sequence, Tuple
+from ...core.config import get_settings
+from ...utils.caching import once, ttl_cache
+
+if TYPE_CHECKING:
+    from clickhouse_driver import Client
+
+
+class _CHConfig(NamedTuple):
+    """Plain snapshot of the ClickHouse connection settings."""
+    host: str
+    port: int
+    user: str
+    password: str
+    database: str
+
+
+def _snapshot_config() -> _CHConfig:
+    """Read the connection settings, including the password secret."""
+    ch = get_settings().clickhouse
+    return _CHConfig(ch.host, ch.port, ch.user, ch.password.get_secret_value(), ch.database)
+
+
+# Parameters for queries called without any. Substitution still runs, so a
+# literal '%' is written as '%%' either way, but no dict is allocated per
+# call. Shared by every query and never mutated.
+_EMPTY: Dict[str, Any] = {}
+
+# Connection settings are read when the first client is built and shared by
+# all clients after that; importing this module does not need credentials
+_CFG: Optional[_CHConfig] = None
+_CFG_LOCK = Lock()
+
+
+def _config() -> _CHConfig:
+    """Get the connection settings snapshot, taking it on first use."""
+    global _CFG
+    cfg = _CFG
+    if cfg is None:
+        with _CFG_LOCK:
+            if _CFG is None:
+                _CFG = _snapshot_config()
+            cfg = _CFG
+    return cfg
+
+
+def reload_ch_config() -> None:
+    """Re-read the connection settings after they have changed.
+    
+    The global settings are reloaded from the environment, and the next
+    client is built from them; existing pools keep their connections.
+    """
+    global _CFG
+    with _CFG_LOCK:
+        get_settings.cache_clear()
+        _CFG = None
+
+
+def _row_type(columns: Sequence[Tuple[str, str]]):
+    """Build a named tuple type for rows with the given column names and types.
+    
+    Row._make is a Python classmethod wrapping tuple.__new__, so converting
+    rows with it costs one Python-level call per row.
+    """
+    return namedtuple('Row', [col[0] for col in columns], rename=True)
+
 
 class ClickHouseClient:
-    """Client for secure interaction with ClickHouse."""
+    """Client for secure interaction with ClickHouse.
+    
+    Every query goes through the driver's %-style substitution, with or
+    without params, so a literal '%' must be written as '%%'.
+    
+    Each query borrows a connection from the pool for its duration;
+    execute_query_stream and execute_query_blocks hold theirs until the
+    iterator is exhausted or closed.
+    """
 
-    def __init__(self):
-        self._client = Client(
-            host=settings.clickhouse.host,
-            port=settings.clickhouse.port,
-            user=settings.clickhouse.user,
-            password=settings.clickhouse.password.get_secret_value(),
-            database=settings.clickhouse.database,
-        )
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        acquire_timeout: float = 30.0,
+        use_numpy: bool = False
+    ):
+        """Initialize ClickHouse client.
+        
+        Args:
+            pool_size: Number of driver connections shared between threads
+                (defaults to the CPU count, but at least 4); connections
+                open on first use
+            acquire_timeout: Seconds a query waits for a free connection
+                before failing
+            use_numpy: Have the driver decode every result straight into
+                NumPy arrays (requires the "numpy" extra)
+        """
+        # Imported here so processes that never query ClickHouse skip the driver
+        from clickhouse_driver import Client
+
+        cfg = _config()
+        pool_size = pool_size or max(os.cpu_count() or 1, 4)
+        self._acquire_timeout = acquire_timeout
+        self._pool: "queue.Queue[Client]" = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(Client(
+                host=cfg.host,
+                port=cfg.port,
+                user=cfg.user,
+                password=cfg.password,
+                database=cfg.database,
+                settings={'use_numpy': True} if use_numpy else None
+            ))
+
+    @contextmanager
+    def _acquire(self) -> Iterator["Client"]:
+        """Borrow a driver client from the pool, waiting if all are in use.
+        
+        Raises:
+            TimeoutError: If no connection is returned to the pool within
+                the acquire timeout
+        """
+        try:
+            client = self._pool.get(timeout=self._acquire_timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No ClickHouse connection became free within {self._acquire_timeout}s; "
+                f"all {self._pool.maxsize} are in use (open query streams hold one each)"
+            ) from None
+        try:
+            yield client
+        except BaseException:
+            # The query may not have been fully read; reconnect on next use
+            client.disconnect()
+            raise
+        finally:
+            self._pool.put(client)
 
     def execute_query(self, query: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Execute a query to ClickHouse.
@@ -26,16 +151,70 @@ class ClickHouseClient:
         Returns:
             List of dictionaries with query results
         """
-        result = self._client.execute(
-            query,
-            params or {},
-            with_column_types=True
-        )
-        rows, columns = result
+        with self._acquire() as client:
+            rows, columns = client.execute(
+                query,
+                params or _EMPTY,
+                with_column_types=True
+            )
         column_names = [col[0] for col in columns]
         return [dict(zip(column_names, row)) for row in rows]
 
-    def execute_query_stream(self, query: str, params: Dict[str, Any] = None):
+    def execute_query_rows(
+        self, query: str, params: Dict[str, Any] = None
+    ) -> List[Tuple[Any, ...]]:
+        """Execute a query to ClickHouse and return rows as named tuples.
+        
+        Building a named tuple per row is cheaper than building a dict, and
+        each row takes less than half the memory of the dictionaries
+        returned by execute_query.
+        
+        Args:
+            query: SQL query string
+            params: Query parameters for safe substitution
+            
+        Returns:
+            List of named tuples with query results; use row._asdict() to
+            get a dictionary
+        """
+        with self._acquire() as client:
+            rows, columns = client.execute(
+                query,
+                params or _EMPTY,
+                with_column_types=True
+            )
+        return list(map(_row_type(columns)._make, rows))
+
+    def execute_query_columnar(
+        self, query: str, params: Dict[str, Any] = None
+    ) -> Dict[str, Sequence[Any]]:
+        """Execute a query to ClickHouse and return results column by column.
+
+        Unlike execute_query, no dictionary is built per row, which makes
+        this the cheaper choice for large result sets. Columns are NumPy
+        arrays when the client was created with use_numpy=True.
+
+        Args:
+            query: SQL query string
+            params: Query parameters for safe substitution
+
+        Returns:
+            Dictionary mapping column names to sequences of column values
+        """
+        with self._acquire() as client:
+            data, columns = client.execute(
+                query,
+                params or _EMPTY,
+                with_column_types=True,
+                columnar=True
+            )
+        if not data:
+            data = [()] * len(columns)
+        return {col[0]: values for col, values in zip(columns, data)}
+
+    def execute_query_stream(
+        self, query: str, params: Dict[str, Any] = None
+    ) -> Iterator[Tuple[Any, ...]]:
         """Stream execution of a query to ClickHouse.
         
         Args:
@@ -43,22 +222,87 @@ class ClickHouseClient:
             params: Query parameters for safe substitution
             
         Yields:
-            Individual rows from the query result
+            Individual rows from the query result as named tuples; use
+            row._asdict() to get a dictionary
         """
-        for row in self._client.execute_iter(query, params or {}):
-            yield row
+        with self._acquire() as client:
+            rows = client.execute_iter(query, params or _EMPTY, with_column_types=True)
+            columns = next(rows, None)
+            if columns is None:
+                return
+            yield from map(_row_type(columns)._make, rows)
 
+    def execute_query_blocks(
+        self,
+        query: str,
+        params: Dict[str, Any] = None,
+        block_size: int = 65536,
+        named_rows: bool = False
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        """Stream execution of a query to ClickHouse in blocks of rows.
+        
+        Blocks are the driver's own row chunks (execute_iter chunk_size),
+        passed on as lists of plain tuples in SELECT column order. The driver
+        still decodes rows one at a time, but no per-row object is built
+        here, so this is cheaper than execute_query_stream for very large
+        scans. Named tuples are only built when named_rows is set.
+        
+        Args:
+            query: SQL query string
+            params: Query parameters for safe substitution
+            block_size: Maximum number of rows per block, also used as the
+                server-side max_block_size
+            named_rows: Convert each row to a named tuple
+            
+        Yields:
+            Lists of up to block_size rows
+        """
+        with self._acquire() as client:
+            blocks = client.execute_iter(
+                query,
+                params or _EMPTY,
+                with_column_types=True,
+                settings={'max_block_size': block_size},
+                chunk_size=block_size
+            )
+            # The column header arrives as the first item of the first chunk
+            block = next(blocks, None)
+            if not block:
+                return
+            columns = block.pop(0)
+            make_row = _row_type(columns)._make if named_rows else None
+            while True:
+                if block:
+                    yield list(map(make_row, block)) if make_row else block
+                block = next(blocks, None)
+                if block is None:
+                    return
+
+    @ttl_cache(10)
     def ping(self) -> bool:
         """Check connection to ClickHouse.
         
+        The result is cached for 10 seconds; use ping.__wrapped__ to bypass it.
+        
         Returns:
             True if connection is successful, False otherwise
         """
         try:
-            self._client.execute('SELECT 1')
+            with self._acquire() as client:
+                client.execute('SELECT 1')
             return True
         except Exception:
             return False
 
-# Create global client instance
-clickhouse_client = ClickHouseClient()
+
+@once
+def get_clickhouse_client() -> ClickHouseClient:
+    """Get the global client instance, creating it on first call."""
+    return ClickHouseClient()
+
+
+def __getattr__(name: str):
+    """Resolve the module-level ``clickhouse_client`` lazily via get_clickhouse_client."""
+    if name == 'clickhouse_client':
+        return get_clickhouse_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,31 @@
 """Client for working with Miro API."""
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 import requests
-import json
-from typing import Dict, Any, List, Optional
-from core.config import settings
-from core.security import security_manager
+from requests.adapters import HTTPAdapter
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional
+from urllib3.util.retry import Retry
+from ...core.config import get_settings
+from ...utils.caching import once, ttl_cache
+
+logger = logging.getLogger(__name__)
+
+# Shared by every connector created without a custom style, hence read-only
+_DEFAULT_CONNECTOR_STYLE = MappingProxyType({
+    "strokeColor": "#000000",
+    "strokeWidth": "1.0",
+    "strokeStyle": "normal"
+})
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize read-only mappings, which orjson does not handle natively."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 class MiroClient:
     """Client for secure interaction with Miro API."""
@@ -12,6 +33,7 @@ class MiroClient:
     def __init__(self):
         """Initialize Miro client."""
         self._base_url = "https://api.miro.com/v2"
+        settings = get_settings()
         self._token = settings.miro.access_token.get_secret_value()
         self._board_id = settings.miro.board_id  # Using full board ID including equals sign
         self._headers = {
@@ -20,50 +42,70 @@ class MiroClient:
             "Authorization": f"Bearer {self._token}"
         }
 
+        # Board URLs are fixed for the client's lifetime, so build them once
+        self._boards_url = f"{self._base_url}/boards"
+        self._board_url = f"{self._boards_url}/{self._board_id}"
+        self._items_url = f"{self._board_url}/items"
+        self._cards_url = f"{self._board_url}/cards"
+        self._connectors_url = f"{self._board_url}/connectors"
+
+        # Keep connections to api.miro.com alive across requests. Only
+        # idempotent methods are retried, so a failed POST never creates
+        # duplicate items.
+        self._session = requests.Session()
+        self._session.headers.update(self._headers)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=(429, 500, 502, 503, 504),
+                raise_on_status=False
+            )
+        )
+        self._session.mount("https://", adapter)
+
     def _make_request(
-        self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None,
+        self, method: str, url: str, params: Optional[Dict[str, Any]] = None,
         data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Make request to Miro API.
         
         Args:
             method: HTTP method
-            endpoint: API endpoint
+            url: Full API endpoint URL
             params: Query parameters
             data: Request body
             
         Returns:
-            Response data
+            Response data (empty for responses without a body)
             
         Raises:
-            Exception: If request fails
+            requests.exceptions.HTTPError: If request fails
         """
-        url = f"{self._base_url}/{endpoint}"
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self._token}"
-        }
-        
-        # Log request details for debugging
-        print(f"\nMaking request to: {url}")
-        print(f"Headers: {json.dumps(headers, indent=2)}")
-        if data:
-            print(f"Data: {json.dumps(data, indent=2)}")
-            
-        response = requests.request(
+        logger.debug("Miro request: %s %s data=%s", method, url, data)
+
+        response = self._session.request(
             method=method,
             url=url,
-            headers=headers,
             params=params,
-            json=data
+            data=orjson.dumps(data, default=_json_default) if data is not None else None
         )
         
         if not response.ok:
-            print(f"Error response: {json.dumps(response.json(), indent=2)}")
-            response.raise_for_status()
-            
-        return response.json()
+            try:
+                detail = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                detail = response.text
+            raise requests.exceptions.HTTPError(
+                f"Miro API request failed with status {response.status_code}: {detail}",
+                response=response
+            )
+
+        if not response.content:
+            return {}
+        return orjson.loads(response.content)
         
     def get_current_user(self) -> Dict[str, Any]:
         """Get information about the current user.
@@ -71,7 +113,7 @@ class MiroClient:
         Returns:
             Current user data
         """
-        return self._make_request("GET", "boards")  # Using boards endpoint to check token
+        return self._make_request("GET", self._boards_url)  # Using boards endpoint to check token
 
     def get_boards(self, team_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get list of available boards.
@@ -82,10 +124,8 @@ class MiroClient:
         Returns:
             List of boards
         """
-        endpoint = "boards"
-        if team_id:
-            endpoint += f"?team_id={team_id}"
-        return self._make_request("GET", endpoint)
+        params = {"team_id": team_id} if team_id else None
+        return self._make_request("GET", self._boards_url, params=params)
 
     def get_board_info(self) -> Dict[str, Any]:
         """Get information about the current board.
@@ -93,7 +133,7 @@ class MiroClient:
         Returns:
             Board data
         """
-        return self._make_request("GET", f"boards/{self._board_id}")
+        return self._make_request("GET", self._board_url)
 
     def get_board_items(self, item_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get items from the board.
@@ -104,10 +144,8 @@ class MiroClient:
         Returns:
             List of board items
         """
-        endpoint = f"boards/{self._board_id}/items"
-        if item_type:
-            endpoint += f"?type={item_type}"
-        return self._make_request("GET", endpoint)
+        params = {"type": item_type} if item_type else None
+        return self._make_request("GET", self._items_url, params=params)
 
     def create_card(self, title: str, description: str, style: Dict[str, Any] = None, position: Dict[str, Any] = None) -> Dict[str, Any]:
         """Create a card on the board.
@@ -121,8 +159,6 @@ class MiroClient:
         Returns:
             Created card data
         """
-        endpoint = f"boards/{self._board_id}/cards"  # Using /cards endpoint
-        
         data = {
             "data": {
                 "title": title,
@@ -136,7 +172,7 @@ class MiroClient:
         if position:
             data["position"] = position
             
-        return self._make_request("POST", endpoint, data=data)
+        return self._make_request("POST", self._cards_url, data=data)
 
     def update_card(self, card_id: str, title: str = None, description: str = None, style: Dict[str, Any] = None) -> Dict[str, Any]:
         """Update a card on the board.
@@ -150,8 +186,6 @@ class MiroClient:
         Returns:
             Updated card data
         """
-        endpoint = f"boards/{self._board_id}/cards/{card_id}"
-        
         data = {"data": {}}
         if title is not None:
             data["data"]["title"] = title
@@ -160,7 +194,7 @@ class MiroClient:
         if style is not None:
             data["style"] = style
             
-        return self._make_request("PATCH", endpoint, data=data)
+        return self._make_request("PATCH", f"{self._cards_url}/{card_id}", data=data)
 
     def delete_card(self, card_id: str) -> None:
         """Delete a card from the board.
@@ -168,8 +202,60 @@ class MiroClient:
         Args:
             card_id: ID of the card to delete
         """
-        endpoint = f"boards/{self._board_id}/cards/{card_id}"
-        self._make_request("DELETE", endpoint)
+        self._make_request("DELETE", f"{self._cards_url}/{card_id}")
+
+    def create_connector(
+        self, start_item_id: str, end_item_id: str, shape: str = "curved",
+        style: Mapping[str, Any] = None
+    ) -> Dict[str, Any]:
+        """Create a connector between two items on the board.
+
+        Args:
+            start_item_id: ID of the item the connector starts from
+            end_item_id: ID of the item the connector points to
+            shape: Connector shape ("curved", "straight" or "elbowed")
+            style: Optional connector style (e.g. {"strokeColor": "#2196f3"})
+
+        Returns:
+            Created connector data
+        """
+        data = {
+            "startItem": {"id": start_item_id},
+            "endItem": {"id": end_item_id},
+            "shape": shape,
+            "style": _DEFAULT_CONNECTOR_STYLE if style is None else style
+        }
+
+        return self._make_request("POST", self._connectors_url, data=data)
+
+    def create_related_cards(
+        self, cards: List[Dict[str, Any]], shape: str = "curved", max_workers: int = 8
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Create a chain of cards, each connected to the next one.
+
+        Cards do not depend on each other, so they are created concurrently;
+        connectors are created once all card IDs are known.
+
+        Args:
+            cards: Card definitions, each holding create_card keyword arguments
+                (e.g. {"title": "Step 1", "description": "...", "position": {...}})
+            shape: Shape of the connectors between consecutive cards
+            max_workers: Maximum number of concurrent requests to Miro
+
+        Returns:
+            Dictionary with created "cards" (in input order) and "connectors"
+        """
+        if not cards:
+            return {"cards": [], "connectors": []}
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(cards))) as executor:
+            created_cards = list(executor.map(lambda card: self.create_card(**card), cards))
+            connectors = list(executor.map(
+                lambda pair: self.create_connector(pair[0]["id"], pair[1]["id"], shape=shape),
+                zip(created_cards, created_cards[1:])
+            ))
+
+        return {"cards": created_cards, "connectors": connectors}
 
     def get_card_url(self, card_id: str) -> str:
         """Get URL to view the card on Miro board.
@@ -182,9 +268,13 @@ class MiroClient:
         """
         return f"https://miro.com/app/board/{self._board_id}/?moveToWidget={card_id}"
 
+    @ttl_cache(10)
     def check_token(self) -> bool:
         """Check if the token is valid.
         
+        The result is cached for 10 seconds; use check_token.__wrapped__ to
+        bypass it.
+        
         Returns:
             True if the token is valid, False otherwise
         """
@@ -194,9 +284,13 @@ class MiroClient:
         except requests.exceptions.HTTPError:
             return False
 
+    @ttl_cache(10)
     def check_board(self) -> bool:
         """Check if the board exists.
         
+        The result is cached for 10 seconds; use check_board.__wrapped__ to
+        bypass it.
+        
         Returns:
             True if the board exists, False otherwise
         """
@@ -206,5 +300,14 @@ class MiroClient:
         except requests.exceptions.HTTPError:
             return False
 
-# Create global client instance
-miro_client = MiroClient()
+@once
+def get_miro_client() -> MiroClient:
+    """Get the global client instance, creating it on first call."""
+    return MiroClient()
+
+
+def __getattr__(name: str):
+    """Resolve the module-level ``miro_client`` lazily via get_miro_client."""
+    if name == 'miro_client':
+        return get_miro_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
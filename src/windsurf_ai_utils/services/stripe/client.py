@@ -1,27 +1,129 @@
 """Client for working with Stripe API."""
 
-from typing import Dict, Any, List, Optional
-import stripe
-from windsurf_ai_utils.core.config import settings
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional
+from cachetools import TTLCache
+from ...core.config import get_settings
+from ...utils.caching import once
+
+logger = logging.getLogger(__name__)
+
+# Seconds a response stays fresh, by Stripe object name. Balances move with
+# every charge; list pages change only when new objects are created.
+# Resources without an entry are not cached.
+_RESPONSE_TTLS = MappingProxyType({
+    'balance': 5,
+    'balance_transaction': 60,
+    'charge': 30,
+    'payment_intent': 30,
+})
+
+
+def _page_params(
+    limit: int, starting_after: Optional[str], ending_before: Optional[str]
+) -> Dict[str, Any]:
+    """Build parameters for a Stripe list call, leaving out unset cursors."""
+    params = {"limit": limit}
+    if starting_after:
+        params["starting_after"] = starting_after
+    if ending_before:
+        params["ending_before"] = ending_before
+    return params
+
+
+def _payment_intent_invoice(payment_intent: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract invoice information from a payment intent with expanded invoice and charge."""
+    result = {
+        'invoice_id': None,
+        'charge_id': None,
+        'customer_id': payment_intent.get('customer'),
+        'amount': payment_intent.get('amount'),
+        'currency': payment_intent.get('currency'),
+        'status': payment_intent.get('status')
+    }
+    
+    # Try to get invoice from expanded invoice field
+    if payment_intent.get('invoice'):
+        result['invoice_id'] = payment_intent['invoice'].get('id')
+    
+    # If no invoice, try to get through charge
+    if not result['invoice_id'] and payment_intent.get('latest_charge'):
+        charge = payment_intent['latest_charge']
+        result['charge_id'] = charge.get('id')
+        if charge.get('invoice'):
+            result['invoice_id'] = charge['invoice'].get('id')
+    
+    return result
+
 
 class StripeClient:
-    """Client for secure interaction with Stripe API."""
+    """Client for secure interaction with Stripe API.
+    
+    Balances, list pages, payment intents and refunds are cached, and cache
+    hits return the same objects to every caller: treat results as
+    read-only, or copy.deepcopy() them first.
+    """
 
     def __init__(self):
         """Initialize Stripe client."""
+        # The SDK and its HTTP stack are imported here, so importing this
+        # module stays cheap for processes that never talk to Stripe
+        import requests
+        import stripe
+        from requests.adapters import HTTPAdapter
+
+        settings = get_settings()
         self._stripe = stripe
         self._stripe.api_key = settings.stripe.api_key.get_secret_value()
 
+        # Share one keep-alive connection pool across all Stripe calls and
+        # threads; retries are left to the SDK, which adds idempotency keys
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+        # The *_async methods need an async HTTP client; httpx is optional
+        # (the "async" extra), without it only the async methods are unavailable
+        try:
+            async_client = self._stripe.HTTPXClient()
+        except ImportError:
+            async_client = None
+        self._stripe.default_http_client = self._stripe.RequestsClient(
+            session=self._session, async_fallback_client=async_client
+        )
+
+        # Retrieved payment intents and refunds are cached for five minutes so
+        # sweeps resolving the same ID repeatedly hit Stripe only once
+        self._payment_intent_cache = TTLCache(maxsize=10_000, ttl=300)
+        self._refund_cache = TTLCache(maxsize=10_000, ttl=300)
+        self._cache_lock = Lock()
+
+        # Balance and list responses, fresh per _RESPONSE_TTLS; the last value
+        # of each is kept past expiry to fall back on when Stripe is unreachable
+        self._response_caches = {
+            name: TTLCache(maxsize=1024, ttl=ttl) for name, ttl in _RESPONSE_TTLS.items()
+        }
+        self._stale_responses = TTLCache(
+            maxsize=1024, ttl=settings.stripe.cache_fallback_max_age
+        )
+        self._cache_fallback = settings.stripe.cache_fallback
+
     def get_balance(self) -> Dict[str, Any]:
         """Get current account balance.
         
+        The balance is cached for a few seconds, so dashboards polling it
+        do not hit Stripe on every refresh.
+        
         Returns:
             Dict containing available and pending balances
             
         Raises:
             stripe.error.StripeError: If request fails
         """
-        return self._stripe.Balance.retrieve()
+        balance = self._stripe.Balance
+        return self._cached_response(balance, {}, balance.retrieve)
 
     def get_balance_transactions(
         self, 
@@ -42,13 +144,7 @@ class StripeClient:
         Raises:
             stripe.error.StripeError: If request fails
         """
-        params = {"limit": limit}
-        if starting_after:
-            params["starting_after"] = starting_after
-        if ending_before:
-            params["ending_before"] = ending_before
-            
-        return self._stripe.BalanceTransaction.list(**params)
+        return self._list(self._stripe.BalanceTransaction, limit, starting_after, ending_before)
 
     def get_charges(
         self,
@@ -69,13 +165,7 @@ class StripeClient:
         Raises:
             stripe.error.StripeError: If request fails
         """
-        params = {"limit": limit}
-        if starting_after:
-            params["starting_after"] = starting_after
-        if ending_before:
-            params["ending_before"] = ending_before
-            
-        return self._stripe.Charge.list(**params)
+        return self._list(self._stripe.Charge, limit, starting_after, ending_before)
 
     def get_payment_intents(
         self,
@@ -96,17 +186,134 @@ class StripeClient:
         Raises:
             stripe.error.StripeError: If request fails
         """
-        params = {"limit": limit}
-        if starting_after:
-            params["starting_after"] = starting_after
-        if ending_before:
-            params["ending_before"] = ending_before
+        return self._list(self._stripe.PaymentIntent, limit, starting_after, ending_before)
+
+    def iter_balance_transactions(self, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Iterate over all balance transactions, newest first.
+        
+        Args:
+            page_size: Number of transactions fetched per request
+            
+        Yields:
+            Transaction objects
+            
+        Raises:
+            stripe.error.StripeError: If request fails
+        """
+        return self._iter_list(self._stripe.BalanceTransaction, page_size)
+
+    def iter_charges(self, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Iterate over all charges, newest first.
+        
+        Args:
+            page_size: Number of charges fetched per request
             
-        return self._stripe.PaymentIntent.list(**params)
+        Yields:
+            Charge objects
+            
+        Raises:
+            stripe.error.StripeError: If request fails
+        """
+        return self._iter_list(self._stripe.Charge, page_size)
+
+    def iter_payment_intents(self, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Iterate over all payment intents, newest first.
+        
+        Args:
+            page_size: Number of payment intents fetched per request
+            
+        Yields:
+            Payment intent objects
+            
+        Raises:
+            stripe.error.StripeError: If request fails
+        """
+        return self._iter_list(self._stripe.PaymentIntent, page_size)
+
+    def _list(
+        self,
+        resource: Any,
+        limit: int,
+        starting_after: Optional[str] = None,
+        ending_before: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch one page from a Stripe list endpoint through the response cache.
+        
+        Args:
+            resource: Stripe resource class (e.g. stripe.Charge)
+            limit: Maximum number of objects to return
+            starting_after: Cursor for pagination (after this object id)
+            ending_before: Cursor for pagination (before this object id)
+        """
+        params = _page_params(limit, starting_after, ending_before)
+        return self._cached_response(resource, params, resource.list)
+
+    def _cached_response(
+        self, resource: Any, params: Dict[str, Any], fetch: Callable[..., Any]
+    ) -> Any:
+        """Return a cached response for a request, calling fetch(**params) on a miss.
+        
+        If Stripe cannot be reached and cache fallback is enabled, the last
+        response for the same request is returned even if it has expired,
+        provided it is no older than the configured maximum age.
+        
+        Args:
+            resource: Stripe resource class the request is made for
+            params: Request parameters
+            fetch: Function performing the request
+        """
+        cache = self._response_caches.get(resource.OBJECT_NAME)
+        if cache is None:
+            return fetch(**params)
+
+        key = (resource.OBJECT_NAME, tuple(sorted(params.items())))
+        with self._cache_lock:
+            response = cache.get(key)
+        if response is not None:
+            return response
+
+        try:
+            response = fetch(**params)
+        except self._stripe.error.APIConnectionError:
+            if not self._cache_fallback:
+                raise
+            with self._cache_lock:
+                response = self._stale_responses.get(key)
+            if response is None:
+                raise
+            logger.warning("Stripe unreachable, serving cached %s response", resource.OBJECT_NAME)
+            return response
+
+        with self._cache_lock:
+            cache[key] = response
+            self._stale_responses[key] = response
+        return response
+
+    def _iter_list(self, resource: Any, page_size: int) -> Iterator[Dict[str, Any]]:
+        """Iterate over every object of a Stripe list endpoint.
+        
+        The next page is requested in the background as soon as the current
+        one arrives, so network latency overlaps with the caller's work.
+        Pages are read once per sweep, so they bypass the response cache.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = resource.list(limit=page_size)
+            while True:
+                next_page = None
+                if page.has_more and page.data:
+                    next_page = executor.submit(
+                        resource.list, limit=page_size, starting_after=page.data[-1]['id']
+                    )
+                yield from page.data
+                if next_page is None:
+                    return
+                page = next_page.result()
 
     def get_payment_intent(self, payment_intent_id: str) -> Dict[str, Any]:
         """Get specific payment intent by ID.
         
+        Results are cached for five minutes; see invalidate().
+        
         Args:
             payment_intent_id: The ID of the payment intent to retrieve
             
@@ -116,14 +323,22 @@ class StripeClient:
         Raises:
             stripe.error.StripeError: If request fails
         """
-        return self._stripe.PaymentIntent.retrieve(
-            payment_intent_id,
-            expand=['invoice', 'latest_charge']
-        )
+        with self._cache_lock:
+            payment_intent = self._payment_intent_cache.get(payment_intent_id)
+        if payment_intent is None:
+            payment_intent = self._stripe.PaymentIntent.retrieve(
+                payment_intent_id,
+                expand=['invoice', 'latest_charge']
+            )
+            with self._cache_lock:
+                self._payment_intent_cache[payment_intent_id] = payment_intent
+        return payment_intent
 
     def get_refund(self, refund_id: str) -> Dict[str, Any]:
         """Get specific refund by ID.
         
+        Results are cached for five minutes; see invalidate().
+        
         Args:
             refund_id: The ID of the refund to retrieve
             
@@ -133,10 +348,29 @@ class StripeClient:
         Raises:
             stripe.error.StripeError: If request fails
         """
-        return self._stripe.Refund.retrieve(
-            refund_id,
-            expand=['charge', 'charge.invoice']
-        )
+        with self._cache_lock:
+            refund = self._refund_cache.get(refund_id)
+        if refund is None:
+            refund = self._stripe.Refund.retrieve(
+                refund_id,
+                expand=['charge', 'charge.invoice']
+            )
+            with self._cache_lock:
+                self._refund_cache[refund_id] = refund
+        return refund
+
+    def invalidate(self, object_id: str) -> None:
+        """Drop a cached payment intent or refund.
+        
+        Call this from webhook handlers (e.g. payment_intent.updated,
+        charge.refunded) so the next lookup fetches fresh data.
+        
+        Args:
+            object_id: ID of the payment intent or refund
+        """
+        with self._cache_lock:
+            self._payment_intent_cache.pop(object_id, None)
+            self._refund_cache.pop(object_id, None)
 
     def get_invoice_from_payment_intent(self, payment_intent_id: str) -> Dict[str, Any]:
         """Get invoice information associated with a payment intent.
@@ -150,28 +384,70 @@ class StripeClient:
         Raises:
             stripe.error.StripeError: If request fails
         """
-        payment_intent = self.get_payment_intent(payment_intent_id)
-        result = {
-            'invoice_id': None,
-            'charge_id': None,
-            'customer_id': payment_intent.get('customer'),
-            'amount': payment_intent.get('amount'),
-            'currency': payment_intent.get('currency'),
-            'status': payment_intent.get('status')
-        }
+        return _payment_intent_invoice(self.get_payment_intent(payment_intent_id))
+
+    async def aget_payment_intent(self, payment_intent_id: str) -> Dict[str, Any]:
+        """Get specific payment intent by ID without blocking the event loop.
         
-        # Try to get invoice from expanded invoice field
-        if payment_intent.get('invoice'):
-            result['invoice_id'] = payment_intent['invoice'].get('id')
+        Shares the cache of get_payment_intent. Requires httpx (the "async"
+        extra).
         
-        # If no invoice, try to get through charge
-        if not result['invoice_id'] and payment_intent.get('latest_charge'):
-            charge = payment_intent['latest_charge']
-            result['charge_id'] = charge.get('id')
-            if charge.get('invoice'):
-                result['invoice_id'] = charge['invoice'].get('id')
+        Args:
+            payment_intent_id: The ID of the payment intent to retrieve
+            
+        Returns:
+            Payment intent object
+            
+        Raises:
+            stripe.error.StripeError: If request fails
+        """
+        with self._cache_lock:
+            payment_intent = self._payment_intent_cache.get(payment_intent_id)
+        if payment_intent is None:
+            payment_intent = await self._stripe.PaymentIntent.retrieve_async(
+                payment_intent_id,
+                expand=['invoice', 'latest_charge']
+            )
+            with self._cache_lock:
+                self._payment_intent_cache[payment_intent_id] = payment_intent
+        return payment_intent
+
+    async def aget_invoice_from_payment_intent(self, payment_intent_id: str) -> Dict[str, Any]:
+        """Async version of get_invoice_from_payment_intent.
         
-        return result
+        Args:
+            payment_intent_id: The ID of the payment intent
+            
+        Returns:
+            Dictionary containing invoice_id and additional information
+            
+        Raises:
+            stripe.error.StripeError: If request fails
+        """
+        return _payment_intent_invoice(await self.aget_payment_intent(payment_intent_id))
+
+    async def abatch_invoices(
+        self, payment_intent_ids: Iterable[str], concurrency: int = 16
+    ) -> List[Dict[str, Any]]:
+        """Get invoice information for many payment intents concurrently.
+        
+        Args:
+            payment_intent_ids: IDs of the payment intents
+            concurrency: Maximum number of requests in flight at once
+            
+        Returns:
+            Invoice information for each payment intent, in input order
+            
+        Raises:
+            stripe.error.StripeError: If any request fails
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(payment_intent_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.aget_invoice_from_payment_intent(payment_intent_id)
+
+        return list(await asyncio.gather(*(fetch(pid) for pid in payment_intent_ids)))
 
     def get_invoice_from_refund(self, refund_id: str) -> Dict[str, Any]:
         """Get invoice information associated with a refund.
@@ -202,5 +478,14 @@ class StripeClient:
         
         return result
 
-# Create global client instance
-stripe_client = StripeClient()
+@once
+def get_stripe_client() -> StripeClient:
+    """Get the global client instance, creating it on first call."""
+    return StripeClient()
+
+
+def __getattr__(name: str):
+    """Resolve the module-level ``stripe_client`` lazily via get_stripe_client."""
+    if name == 'stripe_client':
+        return get_stripe_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,72 @@
+"""Caching helpers shared by service clients."""
+
+import time
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, TypeVar
+
+F = TypeVar('F', bound=Callable[..., Any])
+T = TypeVar('T')
+
+
+def ttl_cache(seconds: float) -> Callable[[F], F]:
+    """Cache the result of a method without arguments for a number of seconds.
+    
+    Results are stored per instance. The undecorated method is available as
+    ``method.__wrapped__`` for callers that need a fresh result.
+    
+    Args:
+        seconds: How long a result stays valid
+    """
+    def decorator(func: F) -> F:
+        attr = f'_ttl_cache_{func.__name__}'
+
+        @wraps(func)
+        def wrapper(self):
+            now = time.monotonic()
+            cached = self.__dict__.get(attr)
+            if cached is not None and now - cached[0] < seconds:
+                return cached[1]
+            value = func(self)
+            self.__dict__[attr] = (now, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def once(func: Callable[[], T]) -> Callable[[], T]:
+    """Call a factory without arguments at most once and keep its result.
+    
+    Unlike ``functools.lru_cache``, concurrent first calls never run the
+    factory twice: they wait for the thread that got there first. Later
+    calls return the stored result without taking the lock. Call
+    ``cache_clear()`` on the wrapper to have the next call run the factory
+    again.
+    
+    Args:
+        func: Factory creating the shared object
+    """
+    lock = Lock()
+    missing = object()
+    value: Any = missing
+
+    @wraps(func)
+    def wrapper() -> T:
+        nonlocal value
+        current = value
+        if current is missing:
+            with lock:
+                if value is missing:
+                    value = func()
+                current = value
+        return current
+
+    def cache_clear() -> None:
+        nonlocal value
+        with lock:
+            value = missing
+
+    wrapper.cache_clear = cache_clear
+    return wrapper
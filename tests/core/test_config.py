@@ -0,0 +1,35 @@
+"""Tests for configuration loading."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+
+
+def test_modules_import_without_credentials(tmp_path):
+    """Test importing modules does not load settings or require credentials."""
+    env = {
+        key: value for key, value in os.environ.items()
+        if not key.startswith(('CLICKHOUSE_', 'MIRO_', 'STRIPE_', 'ENCRYPTION_'))
+    }
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    code = (
+        "import windsurf_ai_utils.core.security, windsurf_ai_utils.core.validation\n"
+        "import windsurf_ai_utils.services.clickhouse.client\n"
+        "import windsurf_ai_utils.services.miro.client\n"
+        "import windsurf_ai_utils.services.stripe.client\n"
+        "from pydantic import ValidationError\n"
+        "from windsurf_ai_utils.core.config import get_settings\n"
+        "try:\n"
+        "    get_settings()\n"
+        "except ValidationError:\n"
+        "    pass\n"
+        "else:\n"
+        "    raise AssertionError('credentials leaked into the test environment')\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
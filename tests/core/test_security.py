@@ -0,0 +1,147 @@
+"""Tests for security manager."""
+
+import time
+from datetime import datetime
+import jwt
+import pytest
+from unittest.mock import patch
+from windsurf_ai_utils.core.security import SecurityManager
+
+
+@pytest.fixture
+def manager():
+    """Create security manager with a test encryption key."""
+    with patch('windsurf_ai_utils.core.security.get_settings') as get_settings:
+        mock = get_settings.return_value
+        mock.security.encryption_key.get_secret_value.return_value = "k" * 32
+        yield SecurityManager()
+
+
+def test_encrypt_decrypt_roundtrip(manager):
+    """Test encrypted data decrypts back to the original payload."""
+    token = manager.encrypt_sensitive_data({"card": "4242", "amount": 10})
+    assert manager.decrypt_sensitive_data(token) == {"card": "4242", "amount": 10}
+
+
+def test_tokens_are_standard_jwts(manager):
+    """Test tokens interoperate with PyJWT in both directions."""
+    token = manager.encrypt_sensitive_data({"card": "4242"})
+    assert jwt.decode(token, "k" * 32, algorithms=["HS256"]) == {"card": "4242"}
+
+    other = jwt.encode({"card": "4242"}, "k" * 32, algorithm="HS256", headers={"kid": "1"})
+    assert manager.decrypt_sensitive_data(other) == {"card": "4242"}
+
+
+def test_payload_encoding_matches_pyjwt(manager):
+    """Test payload encoding follows json.dumps as used by PyJWT."""
+    token = manager.encrypt_sensitive_data({1: "x", "name": "Jürgen"})
+    assert manager.decrypt_sensitive_data(token) == {"1": "x", "name": "Jürgen"}
+    assert jwt.decode(token, "k" * 32, algorithms=["HS256"]) == {"1": "x", "name": "Jürgen"}
+
+    with pytest.raises(TypeError):
+        jwt.encode({"created": datetime(2024, 1, 1)}, "k" * 32, algorithm="HS256")
+    with pytest.raises(TypeError):
+        manager.encrypt_sensitive_data({"created": datetime(2024, 1, 1)})
+
+
+def test_pyjwt_claims_validated(manager):
+    """Test aud, iss, sub and jti claims are validated as PyJWT does."""
+    token = manager.encrypt_sensitive_data({"card": "4242", "aud": "other-service"})
+    with pytest.raises(jwt.InvalidAudienceError):
+        manager.decrypt_sensitive_data(token)
+
+    token = manager.encrypt_sensitive_data({"card": "4242", "sub": 42})
+    with pytest.raises(jwt.InvalidTokenError):
+        jwt.decode(token, "k" * 32, algorithms=["HS256"])
+    with pytest.raises(jwt.InvalidTokenError):
+        manager.decrypt_sensitive_data(token)
+
+    token = manager.encrypt_sensitive_data({"card": "4242", "sub": "user-1"})
+    assert manager.decrypt_sensitive_data(token) == {"card": "4242", "sub": "user-1"}
+
+
+def test_encrypt_rejects_non_dict_payload(manager):
+    """Test only JSON objects are accepted as payloads, as with PyJWT."""
+    with pytest.raises(TypeError):
+        manager.encrypt_sensitive_data(["card", "4242"])
+
+
+def test_expired_token_rejected(manager):
+    """Test time claims are still validated."""
+    token = manager.encrypt_sensitive_data({"card": "4242", "exp": int(time.time()) - 10})
+    with pytest.raises(jwt.ExpiredSignatureError):
+        manager.decrypt_sensitive_data(token)
+
+
+def test_future_iat_rejected(manager):
+    """Test tokens issued in the future are rejected, as PyJWT does."""
+    token = manager.encrypt_sensitive_data({"card": "4242", "iat": int(time.time()) + 1000})
+    with pytest.raises(jwt.ImmatureSignatureError):
+        jwt.decode(token, "k" * 32, algorithms=["HS256"])
+    with pytest.raises(jwt.ImmatureSignatureError):
+        manager.decrypt_sensitive_data(token)
+
+
+def test_cached_token_expires(manager):
+    """Test expiry is checked on every call, not only on the first decode."""
+    exp = int(time.time()) + 60
+    token = manager.encrypt_sensitive_data({"card": "4242", "exp": exp})
+    assert manager.decrypt_sensitive_data(token)["card"] == "4242"
+
+    with patch('windsurf_ai_utils.core.security.time.time', return_value=exp + 1):
+        with pytest.raises(jwt.ExpiredSignatureError):
+            manager.decrypt_sensitive_data(token)
+
+
+def test_required_claims(manager):
+    """Test missing required claims are rejected."""
+    token = manager.encrypt_sensitive_data({"card": "4242"})
+    assert manager.decrypt_sensitive_data(token, required_claims=["card"])["card"] == "4242"
+    with pytest.raises(jwt.MissingRequiredClaimError):
+        manager.decrypt_sensitive_data(token, required_claims=["card", "user"])
+
+
+def test_decrypt_is_cached(manager):
+    """Test decrypting the same token twice reuses the verified payload."""
+    token = manager.encrypt_sensitive_data({"card": "4242"})
+    with patch.object(manager, '_sign', wraps=manager._sign) as mock_sign:
+        first = manager.decrypt_sensitive_data(token)
+        second = manager.decrypt_sensitive_data(token)
+    assert mock_sign.call_count == 1
+    assert first == second
+
+
+def test_decrypt_results_are_independent(manager):
+    """Test mutating a decrypted payload does not affect later calls."""
+    token = manager.encrypt_sensitive_data({"user": "a", "roles": ["viewer"]})
+    manager.decrypt_sensitive_data(token)["roles"].append("admin")
+
+    assert manager.decrypt_sensitive_data(token) == {"user": "a", "roles": ["viewer"]}
+
+
+def test_decrypt_rejects_tampered_token(manager):
+    """Test decryption fails for a token signed with another key."""
+    token = jwt.encode({"card": "4242"}, "x" * 32, algorithm="HS256")
+    with pytest.raises(jwt.InvalidSignatureError):
+        manager.decrypt_sensitive_data(token)
+
+    header, payload, signature = manager.encrypt_sensitive_data({"card": "4242"}).split(".")
+    forged = jwt.utils.base64url_encode(b'{"card":"0000"}').decode()
+    with pytest.raises(jwt.InvalidSignatureError):
+        manager.decrypt_sensitive_data(f"{header}.{forged}.{signature}")
+
+
+def test_decrypt_rejects_altered_signature_encoding(manager):
+    """Test signatures must match byte for byte, not just decode to the same digest."""
+    token = manager.encrypt_sensitive_data({"card": "4242"})
+    for altered in (token + "=", token + "!", token[:-1]):
+        with pytest.raises(jwt.InvalidSignatureError):
+            manager.decrypt_sensitive_data(altered)
+
+
+def test_mask_sensitive_string():
+    """Test masking leaves only the last characters visible."""
+    assert SecurityManager.mask_sensitive_string("4242424242424242") == "************4242"
+    assert SecurityManager.mask_sensitive_string("abc") == "***"
+    assert SecurityManager.mask_sensitive_string("") == ""
+    assert SecurityManager.mask_sensitive_string("secret", visible_chars=0) == "******"
@@ -2,13 +2,14 @@
 
 import pytest
 from unittest.mock import patch, MagicMock
-from core.validation import validate_miro_config, validate_clickhouse_config
+from windsurf_ai_utils.core.validation import validate_miro_config, validate_clickhouse_config, validate_all
 
 
 @pytest.fixture
 def mock_settings():
     """Mock settings for testing."""
-    with patch('core.validation.settings') as mock:
+    with patch('windsurf_ai_utils.core.validation.get_settings') as get_settings:
+        mock = get_settings.return_value
         # Mock Miro settings
         mock.miro.access_token.get_secret_value.return_value = "test_token"
         mock.miro.board_id = "test_board="
@@ -39,6 +40,14 @@ def test_validate_miro_config_missing_token(mock_settings):
     assert "token is missing" in result["errors"][0].lower()
 
 
+def test_validate_miro_config_invalid_token(mock_settings):
+    """Test Miro config validation with invalid token characters."""
+    mock_settings.miro.access_token.get_secret_value.return_value = "bad token!"
+    result = validate_miro_config()
+    assert not result["valid"]
+    assert "token has invalid format" in result["errors"][0].lower()
+
+
 def test_validate_miro_config_invalid_board_id(mock_settings):
     """Test Miro config validation with invalid board ID."""
     mock_settings.miro.board_id = "invalid board id"
@@ -76,3 +85,11 @@ def test_validate_clickhouse_config_missing_password(mock_settings):
     result = validate_clickhouse_config()
     assert not result["valid"]
     assert "password" in result["errors"][0].lower()
+
+
+def test_validate_all_parallel(mock_settings):
+    """Test parallel validation returns the same results as sequential."""
+    mock_settings.miro.board_id = "test_board"
+    expected = validate_all()
+    assert validate_all(parallel=True) == expected
+    assert set(expected) == {"miro", "clickhouse"}
@@ -0,0 +1,243 @@
+"""Tests for ClickHouse client."""
+
+import importlib
+import sys
+import pytest
+from unittest.mock import MagicMock, patch
+from windsurf_ai_utils.core import config
+from windsurf_ai_utils.services.clickhouse import client as clickhouse_module
+from windsurf_ai_utils.services.clickhouse.client import ClickHouseClient
+
+
+@pytest.fixture(autouse=True)
+def mock_settings(monkeypatch):
+    """Mock settings and drop the connection snapshot cached by earlier tests."""
+    monkeypatch.setattr(clickhouse_module, '_CFG', None)
+    with patch('windsurf_ai_utils.services.clickhouse.client.get_settings') as get_settings:
+        mock = get_settings.return_value
+        mock.clickhouse.host = "localhost"
+        mock.clickhouse.port = 9000
+        mock.clickhouse.user = "default"
+        mock.clickhouse.password.get_secret_value.return_value = "password"
+        mock.clickhouse.database = "default"
+        yield mock
+
+
+@pytest.fixture
+def mock_driver():
+    """Mock clickhouse_driver client for testing."""
+    with patch('clickhouse_driver.Client') as mock:
+        yield mock.return_value
+
+
+@pytest.fixture
+def client(mock_driver):
+    """Create test client instance."""
+    return ClickHouseClient(pool_size=2)
+
+
+def test_execute_query(client, mock_driver):
+    """Test query results are returned as dictionaries."""
+    mock_driver.execute.return_value = (
+        [(1, "a"), (2, "b")],
+        [("id", "UInt32"), ("name", "String")]
+    )
+
+    rows = client.execute_query("SELECT id, name FROM t")
+
+    assert rows == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+
+
+def test_execute_query_rows(client, mock_driver):
+    """Test query results are returned as named tuples."""
+    mock_driver.execute.return_value = (
+        [(1, "a"), (2, "b")],
+        [("id", "UInt32"), ("name", "String")]
+    )
+
+    rows = client.execute_query_rows("SELECT id, name FROM t")
+
+    assert rows == [(1, "a"), (2, "b")]
+    assert rows[1].name == "b"
+
+
+def test_execute_query_without_params_keeps_substitution(client, mock_driver):
+    """Test queries without parameters still go through substitution."""
+    mock_driver.execute.return_value = ([], [("name", "String")])
+
+    client.execute_query("SELECT '100%%'")
+    client.execute_query("SELECT '100%%'")
+    first, second = mock_driver.execute.call_args_list
+    assert first[0] == ("SELECT '100%%'", {})
+    assert first[0][1] is second[0][1]
+
+    client.execute_query("SELECT name FROM t WHERE id = %(id)s", {"id": 1})
+    assert mock_driver.execute.call_args[0][1] == {"id": 1}
+
+
+def test_execute_query_columnar(client, mock_driver):
+    """Test columnar query results are keyed by column name."""
+    mock_driver.execute.return_value = (
+        [(1, 2), ("a", "b")],
+        [("id", "UInt32"), ("name", "String")]
+    )
+
+    columns = client.execute_query_columnar("SELECT id, name FROM t")
+
+    assert mock_driver.execute.call_args[1]["columnar"]
+    assert columns == {"id": (1, 2), "name": ("a", "b")}
+
+
+def test_driver_result_class():
+    """Test pooled driver clients decode into the driver's plain result class by default."""
+    from clickhouse_driver.result import QueryResult
+
+    client = ClickHouseClient(pool_size=1)
+
+    assert client._pool.get_nowait().query_result_cls is QueryResult
+
+
+def test_driver_result_class_numpy():
+    """Test use_numpy builds driver clients that decode into NumPy results."""
+    pytest.importorskip("numpy")
+    pytest.importorskip("pandas")
+    from clickhouse_driver.numpy.result import NumpyQueryResult
+
+    client = ClickHouseClient(pool_size=1, use_numpy=True)
+
+    assert client._pool.get_nowait().query_result_cls is NumpyQueryResult
+
+
+def test_execute_query_columnar_empty(client, mock_driver):
+    """Test columnar query with no rows still returns every column."""
+    mock_driver.execute.return_value = ([], [("id", "UInt32"), ("name", "String")])
+
+    columns = client.execute_query_columnar("SELECT id, name FROM t WHERE 0")
+
+    assert columns == {"id": (), "name": ()}
+
+
+def test_execute_query_stream(client, mock_driver):
+    """Test streamed rows are named tuples built from the column header."""
+    mock_driver.execute_iter.return_value = iter([
+        [("id", "UInt32"), ("name", "String")],
+        (1, "a"),
+        (2, "b")
+    ])
+
+    rows = list(client.execute_query_stream("SELECT id, name FROM t"))
+
+    assert rows == [(1, "a"), (2, "b")]
+    assert rows[0].name == "a"
+    assert rows[1]._asdict() == {"id": 2, "name": "b"}
+
+
+def test_execute_query_stream_empty(client, mock_driver):
+    """Test streaming a query that returns no blocks."""
+    mock_driver.execute_iter.return_value = iter([])
+
+    assert list(client.execute_query_stream("SELECT 1 WHERE 0")) == []
+
+
+def test_execute_query_blocks(client, mock_driver):
+    """Test driver chunks are passed on as blocks of plain rows."""
+    mock_driver.execute_iter.return_value = iter(
+        [[[("id", "UInt32")], (0,)], [(1,), (2,)], [(3,), (4,)]]
+    )
+
+    blocks = list(client.execute_query_blocks("SELECT id FROM t", block_size=2))
+
+    assert mock_driver.execute_iter.call_args[1]["settings"] == {"max_block_size": 2}
+    assert mock_driver.execute_iter.call_args[1]["chunk_size"] == 2
+    assert blocks == [[(0,)], [(1,), (2,)], [(3,), (4,)]]
+
+
+def test_execute_query_blocks_named_rows(client, mock_driver):
+    """Test named tuples are built only when requested."""
+    mock_driver.execute_iter.return_value = iter([[[("id", "UInt32")]], [(1,), (2,)]])
+
+    blocks = list(client.execute_query_blocks("SELECT id FROM t", named_rows=True))
+
+    assert [[row.id for row in block] for block in blocks] == [[1, 2]]
+
+
+def test_execute_query_blocks_empty(client, mock_driver):
+    """Test a query without results yields no blocks."""
+    mock_driver.execute_iter.return_value = iter([])
+
+    assert list(client.execute_query_blocks("SELECT 1 WHERE 0")) == []
+
+
+def test_abandoned_stream_releases_connection(client, mock_driver):
+    """Test a partially read stream disconnects and returns its connection."""
+    mock_driver.execute_iter.return_value = iter([[("id", "UInt32")], (1,), (2,)])
+
+    rows = client.execute_query_stream("SELECT id FROM t")
+    next(rows)
+    assert client._pool.qsize() == 1
+    rows.close()
+
+    mock_driver.disconnect.assert_called_once()
+    assert client._pool.qsize() == 2
+
+
+def test_ping_is_cached(client, mock_driver):
+    """Test repeated pings within the TTL reuse the first result."""
+    assert client.ping()
+    assert client.ping()
+    assert mock_driver.execute.call_count == 1
+
+    mock_driver.execute.side_effect = Exception("connection refused")
+    assert client.ping()
+    assert not ClickHouseClient.ping.__wrapped__(client)
+
+
+def test_reload_ch_config(monkeypatch, request):
+    """Test settings are read on first client construction, not on import, and after a reload."""
+    env = {
+        "CLICKHOUSE_HOST": "ch-1",
+        "CLICKHOUSE_PASSWORD": "password",
+        "MIRO_ACCESS_TOKEN": "token",
+        "MIRO_BOARD_ID": "board=",
+        "STRIPE_API_KEY": "sk_test",
+        "ENCRYPTION_KEY": "k" * 32,
+    }
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    config.get_settings.cache_clear()
+    request.addfinalizer(config.get_settings.cache_clear)
+
+    get_settings = MagicMock(wraps=config.get_settings)
+    monkeypatch.setattr(config, 'get_settings', get_settings)
+    monkeypatch.setattr(sys.modules['windsurf_ai_utils.services.clickhouse'], 'client', clickhouse_module)
+    monkeypatch.delitem(sys.modules, clickhouse_module.__name__)
+    module = importlib.import_module(clickhouse_module.__name__)
+    get_settings.assert_not_called()
+
+    with patch('clickhouse_driver.Client') as driver:
+        module.ClickHouseClient(pool_size=1)
+        module.ClickHouseClient(pool_size=1)
+    assert get_settings.call_count == 1
+    assert driver.call_args[1]['host'] == 'ch-1'
+
+    monkeypatch.setenv("CLICKHOUSE_HOST", "ch-2")
+    module.reload_ch_config()
+    with patch('clickhouse_driver.Client') as driver:
+        module.ClickHouseClient(pool_size=1)
+
+    assert driver.call_args[1]['host'] == 'ch-2'
+
+
+def test_exhausted_pool_times_out(mock_driver):
+    """Test a query fails instead of hanging while an open stream holds the only connection."""
+    client = ClickHouseClient(pool_size=1, acquire_timeout=0.01)
+    mock_driver.execute_iter.return_value = iter([[("id", "UInt32")], (1,), (2,)])
+    mock_driver.execute.return_value = ([], [("id", "UInt32")])
+
+    rows = client.execute_query_stream("SELECT id FROM t")
+    next(rows)
+    with pytest.raises(TimeoutError):
+        client.execute_query("SELECT 1")
+
+    rows.close()
+    assert client.execute_query("SELECT 1") == []
@@ -1,14 +1,16 @@
 """Tests for Miro client."""
 
+import orjson
 import pytest
 from unittest.mock import patch, MagicMock
-from services.miro.client import MiroClient
+from windsurf_ai_utils.services.miro.client import MiroClient
 
 
 @pytest.fixture
 def mock_settings():
     """Mock settings for testing."""
-    with patch('services.miro.client.settings') as mock:
+    with patch('windsurf_ai_utils.services.miro.client.get_settings') as get_settings:
+        mock = get_settings.return_value
         mock.miro.access_token.get_secret_value.return_value = "test_token"
         mock.miro.board_id = "test_board="
         yield mock
@@ -22,14 +24,14 @@ def client(mock_settings):
 
 def test_create_card_success(client):
     """Test successful card creation."""
-    with patch('services.miro.client.requests.request') as mock_request:
+    with patch.object(client._session, 'request') as mock_request:
         # Setup mock response
         mock_response = MagicMock()
         mock_response.ok = True
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "id": "test_card_id",
             "type": "card"
-        }
+        })
         mock_request.return_value = mock_response
         
         # Test card creation
@@ -45,6 +47,8 @@ def test_create_card_success(client):
         args = mock_request.call_args
         assert args[1]["method"] == "POST"
         assert "boards/test_board=/cards" in args[1]["url"]
+        assert orjson.loads(args[1]["data"])["data"]["title"] == "Test Card"
+        assert client._session.headers["Authorization"] == "Bearer test_token"
         
         # Verify card data
         assert card["id"] == "test_card_id"
@@ -53,14 +57,14 @@ def test_create_card_success(client):
 
 def test_create_card_error(client):
     """Test card creation error handling."""
-    with patch('services.miro.client.requests.request') as mock_request:
+    with patch.object(client._session, 'request') as mock_request:
         # Setup mock error response
         mock_response = MagicMock()
         mock_response.ok = False
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "type": "error",
             "message": "Test error"
-        }
+        })
         mock_request.return_value = mock_response
         
         # Test error handling
@@ -73,6 +77,65 @@ def test_create_card_error(client):
         assert "Test error" in str(exc.value)
 
 
+def test_delete_card_empty_response(client):
+    """Test requests returning no body are handled."""
+    with patch.object(client._session, 'request') as mock_request:
+        mock_response = MagicMock()
+        mock_response.ok = True
+        mock_response.content = b""
+        mock_request.return_value = mock_response
+
+        client.delete_card("test_card_id")
+
+        args = mock_request.call_args
+        assert args[1]["method"] == "DELETE"
+        assert args[1]["url"].endswith("/cards/test_card_id")
+        assert args[1]["data"] is None
+
+
+def test_create_connector_default_style(client):
+    """Test connectors without a custom style use the default style."""
+    with patch.object(client._session, 'request') as mock_request:
+        mock_response = MagicMock()
+        mock_response.ok = True
+        mock_response.content = orjson.dumps({"id": "test_connector_id"})
+        mock_request.return_value = mock_response
+
+        client.create_connector("start_id", "end_id")
+
+        body = orjson.loads(mock_request.call_args[1]["data"])
+        assert body["startItem"] == {"id": "start_id"}
+        assert body["endItem"] == {"id": "end_id"}
+        assert body["style"]["strokeColor"] == "#000000"
+
+
+def test_create_related_cards(client):
+    """Test creating a chain of connected cards."""
+    def fake_request(method, url, params, data):
+        body = orjson.loads(data)
+        mock_response = MagicMock()
+        mock_response.ok = True
+        if url.endswith("/cards"):
+            mock_response.content = orjson.dumps({"id": body["data"]["title"], "type": "card"})
+        else:
+            mock_response.content = orjson.dumps({
+                "id": f"{body['startItem']['id']}->{body['endItem']['id']}",
+                "type": "connector"
+            })
+        return mock_response
+
+    with patch.object(client._session, 'request', side_effect=fake_request) as mock_request:
+        result = client.create_related_cards([
+            {"title": "a", "description": "first"},
+            {"title": "b", "description": "second"},
+            {"title": "c", "description": "third"}
+        ])
+
+    assert mock_request.call_count == 5
+    assert [card["id"] for card in result["cards"]] == ["a", "b", "c"]
+    assert [conn["id"] for conn in result["connectors"]] == ["a->b", "b->c"]
+
+
 def test_get_card_url(client):
     """Test card URL generation."""
     url = client.get_card_url("test_card_id")
@@ -1,17 +1,23 @@
 """Tests for Stripe client."""
 
+import asyncio
 import pytest
 from unittest.mock import patch, MagicMock
-from services.stripe.client import StripeClient
+from windsurf_ai_utils.services.stripe.client import StripeClient
 
 @pytest.fixture
 def mock_stripe():
     """Create mock stripe client."""
-    with patch('stripe.Balance') as mock_balance, \
+    with patch('windsurf_ai_utils.services.stripe.client.get_settings') as get_settings, \
+         patch('stripe.Balance') as mock_balance, \
          patch('stripe.BalanceTransaction') as mock_transaction, \
          patch('stripe.Charge') as mock_charge, \
          patch('stripe.PaymentIntent') as mock_intent:
         
+        get_settings.return_value.stripe.api_key.get_secret_value.return_value = "sk_test"
+        get_settings.return_value.stripe.cache_fallback = True
+        get_settings.return_value.stripe.cache_fallback_max_age = 300
+
         # Mock balance response
         mock_balance.retrieve.return_value = {
             'available': [{'amount': 1000, 'currency': 'usd'}],
@@ -88,3 +94,96 @@ def test_get_payment_intents(mock_stripe):
     mock_stripe['intent'].list.assert_called_once_with(limit=5)
     assert len(intents.data) == 1
     assert intents.data[0]['amount'] == 3000
+
+def test_uses_pooled_http_client(mock_stripe):
+    """Test Stripe requests go through the client's pooled session."""
+    client = StripeClient()
+    http_client = client._stripe.default_http_client
+
+    assert isinstance(http_client, client._stripe.RequestsClient)
+    assert http_client._session is client._session
+
+def test_get_payment_intent_cached(mock_stripe):
+    """Test payment intents are fetched once until invalidated."""
+    mock_stripe['intent'].retrieve.return_value = {'id': 'pi_1', 'amount': 3000}
+    client = StripeClient()
+
+    assert client.get_payment_intent('pi_1')['amount'] == 3000
+    assert client.get_invoice_from_payment_intent('pi_1')['amount'] == 3000
+    mock_stripe['intent'].retrieve.assert_called_once_with(
+        'pi_1', expand=['invoice', 'latest_charge']
+    )
+
+    client.invalidate('pi_1')
+    client.get_payment_intent('pi_1')
+    assert mock_stripe['intent'].retrieve.call_count == 2
+
+def test_iter_charges(mock_stripe):
+    """Test iterating charges follows the pagination cursor."""
+    mock_stripe['charge'].list.side_effect = [
+        MagicMock(data=[{'id': 'ch_1'}, {'id': 'ch_2'}], has_more=True),
+        MagicMock(data=[{'id': 'ch_3'}], has_more=False)
+    ]
+    client = StripeClient()
+
+    charges = list(client.iter_charges(page_size=2))
+
+    assert [charge['id'] for charge in charges] == ['ch_1', 'ch_2', 'ch_3']
+    assert mock_stripe['charge'].list.call_args_list[1][1] == {
+        'limit': 2, 'starting_after': 'ch_2'
+    }
+
+def test_list_responses_cached(mock_stripe):
+    """Test identical list requests are served from the response cache."""
+    mock_stripe['charge'].OBJECT_NAME = 'charge'
+    client = StripeClient()
+
+    first = client.get_charges(limit=5)
+    assert client.get_charges(limit=5) is first
+    mock_stripe['charge'].list.assert_called_once_with(limit=5)
+
+    client.get_charges(limit=5, starting_after='ch_1')
+    assert mock_stripe['charge'].list.call_count == 2
+
+def test_stale_response_on_connection_error(mock_stripe):
+    """Test a recent response is served when Stripe is unreachable and fallback is on."""
+    mock_stripe['balance'].OBJECT_NAME = 'balance'
+    client = StripeClient()
+    balance = client.get_balance()
+
+    client._response_caches['balance'].clear()
+    mock_stripe['balance'].retrieve.side_effect = client._stripe.error.APIConnectionError('down')
+
+    assert client.get_balance() is balance
+
+    client._cache_fallback = False
+    with pytest.raises(client._stripe.error.APIConnectionError):
+        client.get_balance()
+
+    client._cache_fallback = True
+    client._stale_responses.expire(client._stale_responses.timer() + 301)
+    with pytest.raises(client._stripe.error.APIConnectionError):
+        client.get_balance()
+
+def test_abatch_invoices(mock_stripe):
+    """Test invoices are resolved concurrently, in input order, through the cache."""
+    in_flight = []
+    peak = []
+
+    async def retrieve_async(payment_intent_id, expand):
+        in_flight.append(payment_intent_id)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(payment_intent_id)
+        return {'id': payment_intent_id, 'invoice': {'id': f'in_{payment_intent_id}'}}
+
+    mock_stripe['intent'].retrieve_async.side_effect = retrieve_async
+    client = StripeClient()
+    ids = [f'pi_{i}' for i in range(10)]
+
+    invoices = asyncio.run(client.abatch_invoices(ids, concurrency=4))
+
+    assert [invoice['invoice_id'] for invoice in invoices] == [f'in_{pid}' for pid in ids]
+    assert max(peak) == 4
+    assert client.get_payment_intent('pi_0')['id'] == 'pi_0'
+    mock_stripe['intent'].retrieve.assert_not_called()
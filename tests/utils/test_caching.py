@@ -0,0 +1,40 @@
+"""Tests for caching helpers."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from windsurf_ai_utils.utils.caching import once
+
+
+def test_once_calls_factory_once_across_threads():
+    """Test concurrent first calls share a single factory call."""
+    calls = []
+
+    @once
+    def factory():
+        calls.append(threading.get_ident())
+        time.sleep(0.05)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: factory(), range(8)))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert factory() is results[0]
+
+
+def test_once_cache_clear():
+    """Test cache_clear makes the next call run the factory again."""
+    calls = []
+
+    @once
+    def factory():
+        calls.append(1)
+        return object()
+
+    first = factory()
+    factory.cache_clear()
+
+    assert factory() is not first
+    assert len(calls) == 2